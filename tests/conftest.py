@@ -1,11 +1,32 @@
 """Shared fixtures for the test suite."""
 
+import functools
 import json
+import logging
+import os
 
 import pytest
 
 from trufflehog_redactor.parser import Finding
 
+_json_dumps = json.dumps
+
+# Only Raw, DetectorName and the file path vary between lines, so the rest of
+# the document is fixed text and each field is escaped with json.dumps.
+_JSON_LINE_TEMPLATE = (
+    '{"Raw": %s, "DetectorName": %s, '
+    '"SourceMetadata": {"Data": {"Filesystem": {"file": %s}}}}'
+)
+
+
+@functools.lru_cache(maxsize=512)
+def _json_line(raw, detector, file_path):
+    return _JSON_LINE_TEMPLATE % (
+        _json_dumps(raw),
+        _json_dumps(detector),
+        _json_dumps(file_path),
+    )
+
 
 @pytest.fixture()
 def make_finding():
@@ -26,17 +47,64 @@ def make_json_line():
     """Factory that builds a TruffleHog JSON line string."""
 
     def _make(raw="SUPERSECRETKEY1234", detector="Generic", file_path="/tmp/test.txt"):
-        obj = {
-            "Raw": raw,
-            "DetectorName": detector,
-            "SourceMetadata": {
-                "Data": {
-                    "Filesystem": {
-                        "file": file_path,
-                    }
-                }
-            },
-        }
-        return json.dumps(obj)
+        return _json_line(raw, detector, file_path)
 
     return _make
+
+
+@pytest.fixture(scope="session")
+def fast_write():
+    """Write text or bytes to a file with a single open/write/close sequence."""
+
+    def _write(path, data):
+        if isinstance(data, str):
+            data = data.encode()
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+    return _write
+
+
+@pytest.fixture(scope="session")
+def fast_read():
+    """Read a whole file as text without going through a TextIOWrapper."""
+
+    def _read(path):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            chunks = []
+            while True:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        finally:
+            os.close(fd)
+        return b"".join(chunks).decode()
+
+    return _read
+
+
+class _ListHandler(logging.Handler):
+    """Logging handler that keeps emitted records in a list."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture()
+def log_records():
+    """List of records logged by trufflehog_redactor during the test."""
+    handler = _ListHandler()
+    logger = logging.getLogger("trufflehog_redactor")
+    logger.addHandler(handler)
+    yield handler.records
+    logger.removeHandler(handler)
+    handler.close()
@@ -1,42 +1,62 @@
 """Tests for trufflehog_redactor.cli."""
 
 import io
-import subprocess
 from unittest.mock import patch
 
 import pytest
 
+from trufflehog_redactor import cli
 from trufflehog_redactor.cli import _confirm_changes, _run_trufflehog
 
 # -- _run_trufflehog ----------------------------------------------------------
 
 
+class _FakePopen:
+    """Popen stand-in with canned output and exit status."""
+
+    def __init__(self, stdout, stderr, returncode, errors):
+        self.stdout = io.BytesIO(stdout)
+        self.returncode = returncode
+        errors.write(stderr)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stdout.close()
+
+
+def _fake_trufflehog(stdout, stderr, returncode):
+    """Patch Popen so trufflehog "emits" *stdout*/*stderr* and exits."""
+
+    def popen(cmd, **kwargs):
+        return _FakePopen(stdout, stderr, returncode, kwargs["stderr"])
+
+    return patch("trufflehog_redactor.cli.subprocess.Popen", side_effect=popen)
+
+
 @pytest.mark.parametrize("desc, returncode", [("rc0", 0), ("rc1", 1)])
 def test_run_trufflehog_success(desc, returncode):
-    fake_result = subprocess.CompletedProcess(
-        args=[], returncode=returncode, stdout='{"Raw":"s"}\n', stderr=""
-    )
-    with patch("trufflehog_redactor.cli.subprocess.run", return_value=fake_result):
-        stream = _run_trufflehog("/tmp/scan")
-    assert isinstance(stream, io.StringIO)
-    assert stream.read() == '{"Raw":"s"}\n'
+    with _fake_trufflehog(b'{"Raw":"s"}\n', b"", returncode), _run_trufflehog(
+        "/tmp/scan"
+    ) as output:
+        assert output.read() == b'{"Raw":"s"}\n'
 
 
 def test_run_trufflehog_not_installed():
     with patch(
-        "trufflehog_redactor.cli.subprocess.run", side_effect=FileNotFoundError
-    ), pytest.raises(SystemExit):
-        _run_trufflehog("/tmp/scan")
+        "trufflehog_redactor.cli.subprocess.Popen", side_effect=FileNotFoundError
+    ), pytest.raises(SystemExit), _run_trufflehog("/tmp/scan"):
+        pass
 
 
-def test_run_trufflehog_error_exit_code():
-    fake_result = subprocess.CompletedProcess(
-        args=[], returncode=2, stdout="", stderr="boom"
-    )
-    with patch("trufflehog_redactor.cli.subprocess.run", return_value=fake_result):
-        with pytest.raises(SystemExit) as exc_info:
-            _run_trufflehog("/tmp/scan")
-        assert exc_info.value.code == 2
+def test_run_trufflehog_error_exit_code(capsys):
+    with _fake_trufflehog(b"", b"boom", 2), pytest.raises(
+        SystemExit
+    ) as exc_info, _run_trufflehog("/tmp/scan") as output:
+        output.read()
+    assert exc_info.value.code == 2
+    assert "boom" in capsys.readouterr().err
 
 
 # -- _confirm_changes ---------------------------------------------------------
@@ -50,14 +70,14 @@ def test_run_trufflehog_error_exit_code():
         ("Empty", "\n", False),
     ],
 )
-def test_confirm_changes(desc, user_input, expected):
-    mock_tty = io.StringIO(user_input)
-    with patch("builtins.open", return_value=mock_tty), patch("builtins.print"):
-        assert _confirm_changes(3, "some diff") is expected
+def test_confirm_changes(desc, user_input, expected, capsys):
+    assert _confirm_changes(3, "some diff", tty=io.StringIO(user_input)) is expected
+    assert "Apply changes to 3 file(s)?" in capsys.readouterr().out
 
 
-def test_confirm_changes_no_tty():
-    with patch("builtins.open", side_effect=OSError("no tty")), patch("builtins.print"):
+def test_confirm_changes_no_tty(capsys):
+    with patch.object(cli, "open", side_effect=OSError("no tty"), create=True):
         with pytest.raises(SystemExit) as exc_info:
             _confirm_changes(3, "some diff")
         assert exc_info.value.code == 1
+    assert "no TTY" in capsys.readouterr().err
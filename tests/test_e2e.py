@@ -1,172 +1,236 @@
-"""End-to-end integration tests that invoke the CLI as a subprocess."""
+"""End-to-end integration tests that drive the CLI against real files."""
 
-import json
+import contextlib
+import io
 import os
+import re
+import shutil
 import stat
 import subprocess
 import sys
+from types import SimpleNamespace
+from unittest.mock import patch
 
-CMD = [sys.executable, "-m", "trufflehog_redactor"]
-
-
-def make_json_line(raw, detector, file_path):
-    """Build one TruffleHog JSON line."""
-    obj = {
-        "Raw": raw,
-        "DetectorName": detector,
-        "SourceMetadata": {
-            "Data": {
-                "Filesystem": {
-                    "file": file_path,
-                }
-            }
-        },
-    }
-    return json.dumps(obj)
+import pytest
 
+from trufflehog_redactor.cli import main
 
-def run_redactor(json_lines, extra_args=None):
-    """Run the CLI in pipe + --no-confirm mode and return the CompletedProcess."""
-    args = CMD + ["--no-confirm"] + (extra_args or [])
-    return subprocess.run(
-        args,
-        input=json_lines,
-        capture_output=True,
-        text=True,
-    )
 
+@pytest.fixture(scope="session")
+def cli_cmd():
+    """Command line for running the package as a real subprocess."""
+    if not sys.executable:
+        pytest.skip("cannot locate the Python interpreter")
+    return [sys.executable, "-m", "trufflehog_redactor"]
 
-# ── Basic redaction flow ─────────────────────────────────────────────
 
+def ndjson(*lines):
+    """Join JSON lines into a newline-terminated NDJSON buffer."""
+    return "".join(line + "\n" for line in lines)
 
-class TestBasicRedaction:
-    def test_basic_redaction(self, tmp_path):
-        """One secret, default asterisk placeholder, verify file modified and stdout."""
-        secret = "SUPERSECRETKEY1234"
-        target = tmp_path / "creds.txt"
-        target.write_text(f"password={secret}\n")
 
-        line = make_json_line(secret, "Generic", str(target))
-        result = run_redactor(line + "\n")
+def run_redactor(json_lines, extra_args=None):
+    """Run the CLI in-process in pipe + --no-confirm mode.
+
+    Returns an object with ``returncode``, ``stdout`` and ``stderr`` like
+    ``subprocess.CompletedProcess``, without paying for an interpreter start.
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    returncode = 0
+    with patch.object(
+        sys, "stdin", io.StringIO(json_lines)
+    ), contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            main(["--no-confirm"] + (extra_args or []))
+        except SystemExit as exc:
+            # Mirror the interpreter: None -> 0, int -> itself, message -> 1
+            if exc.code is None:
+                returncode = 0
+            elif isinstance(exc.code, int):
+                returncode = exc.code
+            else:
+                returncode = 1
+    return SimpleNamespace(
+        returncode=returncode, stdout=stdout.getvalue(), stderr=stderr.getvalue()
+    )
 
-        assert result.returncode == 0
-        assert "Redacted secrets in 1 file(s)." in result.stdout
-        content = target.read_text()
-        assert secret not in content
-        assert "*" in content
 
-    def test_custom_placeholder(self, tmp_path):
-        """--placeholder '[REDACTED]' replaces the secret with that string."""
-        secret = "MY_API_KEY_12345"
-        target = tmp_path / "config.yaml"
-        target.write_text(f"api_key: {secret}\n")
+_FOUND_RE = re.compile(r"^Found (\d+) unique secret\(s\)", re.MULTILINE)
+_REDACTED_RE = re.compile(r"^Redacted secrets in (\d+) file\(s\)\.", re.MULTILINE)
+_DRY_RUN_RE = re.compile(r"^Dry run: (\d+) file\(s\) would be modified\.", re.MULTILINE)
 
-        line = make_json_line(secret, "Generic", str(target))
-        result = run_redactor(line + "\n", extra_args=["--placeholder", "[REDACTED]"])
 
-        assert result.returncode == 0
-        content = target.read_text()
-        assert content == "api_key: [REDACTED]\n"
+def summarize(stdout):
+    """Extract the CLI's summary lines from *stdout* into a dict."""
+    found = _FOUND_RE.search(stdout)
+    modified = _REDACTED_RE.search(stdout)
+    dry_run = _DRY_RUN_RE.search(stdout)
+    if dry_run:
+        modified = dry_run
+    return {
+        "secrets": int(found.group(1)) if found else 0,
+        "files_modified": int(modified.group(1)) if modified else 0,
+        "dry_run": dry_run is not None,
+    }
 
-    def test_default_placeholder_asterisks_match_length(self, tmp_path):
-        """Asterisks count equals the secret length."""
-        secret = "abcdef"
-        target = tmp_path / "f.txt"
-        target.write_text(f"key={secret}\n")
 
-        line = make_json_line(secret, "Generic", str(target))
-        run_redactor(line + "\n")
+# ── Basic redaction flow ─────────────────────────────────────────────
+
+
+class TestBasicRedaction:
+    @pytest.mark.parametrize(
+        "desc, secret, initial, extra_args, expected_content",
+        [
+            (
+                "default-placeholder",
+                "SUPERSECRETKEY1234",
+                "password=SUPERSECRETKEY1234\n",
+                [],
+                "password=" + "*" * 18 + "\n",
+            ),
+            (
+                "custom-placeholder",
+                "MY_API_KEY_12345",
+                "api_key: MY_API_KEY_12345\n",
+                ["--placeholder", "[REDACTED]"],
+                "api_key: [REDACTED]\n",
+            ),
+            (
+                "asterisks-match-length",
+                "abcdef",
+                "key=abcdef\n",
+                [],
+                "key=******\n",
+            ),
+        ],
+    )
+    def test_single_secret(
+        self,
+        tmp_path,
+        desc,
+        secret,
+        initial,
+        extra_args,
+        expected_content,
+        fast_write,
+        fast_read,
+        make_json_line,
+    ):
+        """One secret in one file: exit code 0, file redacted, summary printed."""
+        target = tmp_path / "creds.txt"
+        fast_write(target, initial)
 
-        content = target.read_text()
-        assert content == "key=******\n"
+        line = make_json_line(secret, "Generic", str(target))
+        result = run_redactor(line + "\n", extra_args=extra_args)
 
-    def test_multiple_secrets_in_one_file(self, tmp_path):
+        assert result.returncode == 0
+        assert fast_read(target) == expected_content
+        assert summarize(result.stdout) == {
+            "secrets": 1,
+            "files_modified": 1,
+            "dry_run": False,
+        }
+
+    def test_multiple_secrets_in_one_file(
+        self, tmp_path, fast_write, fast_read, make_json_line
+    ):
         """Two secrets (one a substring of the other), longest-first replacement."""
         short_secret = "SECRET"
         long_secret = "SUPERSECRETLONG"
         target = tmp_path / "multi.txt"
-        target.write_text(f"a={long_secret}\nb={short_secret}\n")
+        fast_write(target, f"a={long_secret}\nb={short_secret}\n")
 
-        lines = (
-            make_json_line(short_secret, "Generic", str(target))
-            + "\n"
-            + make_json_line(long_secret, "Generic", str(target))
-            + "\n"
+        lines = ndjson(
+            make_json_line(short_secret, "Generic", str(target)),
+            make_json_line(long_secret, "Generic", str(target)),
         )
         result = run_redactor(lines, extra_args=["--placeholder", "[REDACTED]"])
 
         assert result.returncode == 0
-        content = target.read_text()
+        content = fast_read(target)
         assert content == "a=[REDACTED]\nb=[REDACTED]\n"
 
-    def test_multiple_files(self, tmp_path):
+    def test_multiple_files(self, tmp_path, fast_write, fast_read, make_json_line):
         """Secrets across two files, both redacted."""
         s1, s2 = "SECRET_ONE", "SECRET_TWO"
         f1 = tmp_path / "a.txt"
         f2 = tmp_path / "b.txt"
-        f1.write_text(f"val={s1}\n")
-        f2.write_text(f"val={s2}\n")
-
-        lines = (
-            make_json_line(s1, "Generic", str(f1))
-            + "\n"
-            + make_json_line(s2, "Generic", str(f2))
-            + "\n"
+        fast_write(f1, f"val={s1}\n")
+        fast_write(f2, f"val={s2}\n")
+
+        lines = ndjson(
+            make_json_line(s1, "Generic", str(f1)),
+            make_json_line(s2, "Generic", str(f2)),
         )
         result = run_redactor(lines, extra_args=["--placeholder", "XXX"])
 
         assert result.returncode == 0
-        assert "Redacted secrets in 2 file(s)." in result.stdout
-        assert f1.read_text() == "val=XXX\n"
-        assert f2.read_text() == "val=XXX\n"
-
-    def test_multiline_file_content_preserved(self, tmp_path):
+        assert summarize(result.stdout) == {
+            "secrets": 2,
+            "files_modified": 2,
+            "dry_run": False,
+        }
+        assert fast_read(f1) == "val=XXX\n"
+        assert fast_read(f2) == "val=XXX\n"
+
+    def test_multiline_file_content_preserved(
+        self, tmp_path, fast_write, fast_read, make_json_line
+    ):
         """Only the secret line changes; rest of the file stays intact."""
         secret = "LEAK_HERE"
         target = tmp_path / "big.txt"
-        target.write_text("line1\nline2\npassword=LEAK_HERE\nline4\n")
+        fast_write(target, "line1\nline2\npassword=LEAK_HERE\nline4\n")
 
         line = make_json_line(secret, "Generic", str(target))
         run_redactor(line + "\n", extra_args=["--placeholder", "XXX"])
 
-        assert target.read_text() == "line1\nline2\npassword=XXX\nline4\n"
+        assert fast_read(target) == "line1\nline2\npassword=XXX\nline4\n"
 
-    def test_duplicate_findings_deduplicated(self, tmp_path):
+    def test_duplicate_findings_deduplicated(
+        self, tmp_path, fast_write, make_json_line
+    ):
         """Same JSON line twice -> 'Found 1 unique secret(s)'."""
         secret = "DUP_SECRET"
         target = tmp_path / "dup.txt"
-        target.write_text(f"x={secret}\n")
+        fast_write(target, f"x={secret}\n")
 
         line = make_json_line(secret, "Generic", str(target))
-        result = run_redactor(line + "\n" + line + "\n")
+        result = run_redactor(ndjson(line, line))
 
-        assert "Found 1 unique secret(s)" in result.stdout
+        assert summarize(result.stdout)["secrets"] == 1
 
 
 # ── Dry run ──────────────────────────────────────────────────────────
 
 
 class TestDryRun:
-    def test_dry_run_does_not_modify_file(self, tmp_path):
+    def test_dry_run_does_not_modify_file(
+        self, tmp_path, fast_write, fast_read, make_json_line
+    ):
         """File unchanged; stdout has diff + summary."""
         secret = "DONT_TOUCH_ME"
         target = tmp_path / "safe.txt"
-        target.write_text(f"key={secret}\n")
+        fast_write(target, f"key={secret}\n")
 
         line = make_json_line(secret, "Generic", str(target))
         result = run_redactor(line + "\n", extra_args=["--dry-run"])
 
         assert result.returncode == 0
         # File must be untouched
-        assert target.read_text() == f"key={secret}\n"
-        assert "Dry run:" in result.stdout
-        assert "1 file(s) would be modified" in result.stdout
-
-    def test_dry_run_with_custom_placeholder(self, tmp_path):
+        assert fast_read(target) == f"key={secret}\n"
+        assert summarize(result.stdout) == {
+            "secrets": 1,
+            "files_modified": 1,
+            "dry_run": True,
+        }
+
+    def test_dry_run_with_custom_placeholder(
+        self, tmp_path, fast_write, fast_read, make_json_line
+    ):
         """Diff shows custom placeholder; file unchanged."""
         secret = "FRAGILE_KEY"
         target = tmp_path / "cfg.txt"
-        target.write_text(f"token={secret}\n")
+        fast_write(target, f"token={secret}\n")
 
         line = make_json_line(secret, "Generic", str(target))
         result = run_redactor(
@@ -174,8 +238,13 @@ class TestDryRun:
             extra_args=["--dry-run", "--placeholder", "[REMOVED]"],
         )
 
-        assert target.read_text() == f"token={secret}\n"
-        assert "Dry run:" in result.stdout
+        assert fast_read(target) == f"token={secret}\n"
+        assert "+token=[REMOVED]" in result.stdout
+        assert summarize(result.stdout) == {
+            "secrets": 1,
+            "files_modified": 1,
+            "dry_run": True,
+        }
 
 
 # ── Edge cases / no-op paths ────────────────────────────────────────
@@ -194,10 +263,10 @@ class TestEdgeCases:
         assert result.returncode == 0
         assert "No secrets found" in result.stdout
 
-    def test_secret_not_in_file(self, tmp_path):
+    def test_secret_not_in_file(self, tmp_path, fast_write, make_json_line):
         """Valid JSON but secret not actually in the file -> 'No matching secrets'."""
         target = tmp_path / "clean.txt"
-        target.write_text("nothing secret here\n")
+        fast_write(target, "nothing secret here\n")
 
         line = make_json_line("DOES_NOT_EXIST", "Generic", str(target))
         result = run_redactor(line + "\n")
@@ -205,7 +274,7 @@ class TestEdgeCases:
         assert result.returncode == 0
         assert "No matching secrets" in result.stdout
 
-    def test_missing_file_graceful(self, tmp_path):
+    def test_missing_file_graceful(self, tmp_path, make_json_line):
         """Finding references nonexistent file -> no crash."""
         missing = str(tmp_path / "ghost.txt")
         line = make_json_line("SOME_SECRET", "Generic", missing)
@@ -219,78 +288,94 @@ class TestEdgeCases:
 # ── Symlinks ─────────────────────────────────────────────────────────
 
 
+_SYM_SECRET = "SYM_SECRET"
+_REG_SECRET = "REG_SECRET"
+
+
+@pytest.fixture(scope="class")
+def symlink_prototype(tmp_path_factory, fast_write):
+    """Build the symlink test layout once per class."""
+    proto = tmp_path_factory.mktemp("symlink_layout")
+    fast_write(proto / "real.txt", f"key={_SYM_SECRET}\n")
+    # Relative target so copies of the layout stay self-contained
+    (proto / "link.txt").symlink_to("real.txt")
+    fast_write(proto / "normal.txt", f"b={_REG_SECRET}\n")
+    return proto
+
+
+@pytest.fixture()
+def symlink_layout(symlink_prototype, tmp_path):
+    """Per-test copy of the layout: real.txt, link.txt -> real.txt, normal.txt."""
+    shutil.copytree(symlink_prototype, tmp_path, symlinks=True, dirs_exist_ok=True)
+    return tmp_path
+
+
 class TestSymlinks:
-    def test_symlink_skipped(self, tmp_path):
+    def test_symlink_skipped(self, symlink_layout, fast_read, make_json_line):
         """Finding points at a symlink -> skipped, target unchanged."""
-        secret = "SYMLINK_SECRET"
-        real = tmp_path / "real.txt"
-        real.write_text(f"key={secret}\n")
-        link = tmp_path / "link.txt"
-        link.symlink_to(real)
+        real = symlink_layout / "real.txt"
+        link = symlink_layout / "link.txt"
 
-        line = make_json_line(secret, "Generic", str(link))
+        line = make_json_line(_SYM_SECRET, "Generic", str(link))
         result = run_redactor(line + "\n")
 
         assert result.returncode == 0
         # Real file must not be modified since the finding pointed at the symlink
-        assert real.read_text() == f"key={secret}\n"
+        assert fast_read(real) == f"key={_SYM_SECRET}\n"
         # Stderr should mention skipping
         assert (
             "Skipping symlink" in result.stderr
             or "No matching secrets" in result.stdout
         )
 
-    def test_symlink_target_redacted_via_real_path(self, tmp_path):
+    def test_symlink_target_redacted_via_real_path(
+        self, symlink_layout, fast_read, make_json_line
+    ):
         """Real file finding -> real file redacted."""
-        secret = "REAL_SECRET"
-        real = tmp_path / "real.txt"
-        real.write_text(f"val={secret}\n")
-        link = tmp_path / "alias.txt"
-        link.symlink_to(real)
+        real = symlink_layout / "real.txt"
+        link = symlink_layout / "link.txt"
 
         # Finding references the real path, not the symlink
-        line = make_json_line(secret, "Generic", str(real))
+        line = make_json_line(_SYM_SECRET, "Generic", str(real))
         result = run_redactor(line + "\n", extra_args=["--placeholder", "XXX"])
 
         assert result.returncode == 0
-        assert real.read_text() == "val=XXX\n"
+        assert fast_read(real) == "key=XXX\n"
         # Symlink resolves to the same (now-redacted) content
-        assert link.read_text() == "val=XXX\n"
+        assert fast_read(link) == "key=XXX\n"
 
-    def test_symlink_and_regular_file_mixed(self, tmp_path):
+    def test_symlink_and_regular_file_mixed(
+        self, symlink_layout, fast_read, make_json_line
+    ):
         """One symlink finding + one regular finding -> only regular file redacted."""
-        s_sym, s_reg = "SYM_SECRET", "REG_SECRET"
-        real = tmp_path / "real.txt"
-        real.write_text(f"a={s_sym}\n")
-        link = tmp_path / "link.txt"
-        link.symlink_to(real)
-        regular = tmp_path / "normal.txt"
-        regular.write_text(f"b={s_reg}\n")
-
-        lines = (
-            make_json_line(s_sym, "Generic", str(link))
-            + "\n"
-            + make_json_line(s_reg, "Generic", str(regular))
-            + "\n"
+        real = symlink_layout / "real.txt"
+        link = symlink_layout / "link.txt"
+        regular = symlink_layout / "normal.txt"
+
+        lines = ndjson(
+            make_json_line(_SYM_SECRET, "Generic", str(link)),
+            make_json_line(_REG_SECRET, "Generic", str(regular)),
         )
         result = run_redactor(lines, extra_args=["--placeholder", "XXX"])
 
         assert result.returncode == 0
         # Symlink finding skipped, so real file keeps the secret
-        assert s_sym in real.read_text()
+        assert _SYM_SECRET in fast_read(real)
         # Regular file redacted
-        assert regular.read_text() == "b=XXX\n"
+        assert fast_read(regular) == "b=XXX\n"
 
 
 # ── Hard links ───────────────────────────────────────────────────────
 
 
 class TestHardlinks:
-    def test_hardlink_redacted_other_link_retains_old_content(self, tmp_path):
+    def test_hardlink_redacted_other_link_retains_old_content(
+        self, tmp_path, fast_write, fast_read, make_json_line
+    ):
         """os.replace gives new inode; other hard link keeps old content."""
         secret = "HARDLINK_SECRET"
         original = tmp_path / "original.txt"
-        original.write_text(f"key={secret}\n")
+        fast_write(original, f"key={secret}\n")
         other = tmp_path / "other.txt"
         os.link(str(original), str(other))
 
@@ -299,58 +384,73 @@ class TestHardlinks:
 
         assert result.returncode == 0
         # Targeted path is redacted (new inode via os.replace)
-        assert original.read_text() == "key=XXX\n"
+        assert fast_read(original) == "key=XXX\n"
         # Other hard link still points at the old inode
-        assert other.read_text() == f"key={secret}\n"
+        assert fast_read(other) == f"key={secret}\n"
         # Inodes should now differ
         assert os.stat(str(original)).st_ino != os.stat(str(other)).st_ino
 
-    def test_hardlink_both_paths_in_findings(self, tmp_path):
+    def test_hardlink_both_paths_in_findings(
+        self, tmp_path, fast_write, fast_read, make_json_line
+    ):
         """Both hard link paths in findings -> both redacted independently."""
         secret = "SHARED_SECRET"
         path_a = tmp_path / "a.txt"
-        path_a.write_text(f"val={secret}\n")
+        fast_write(path_a, f"val={secret}\n")
         path_b = tmp_path / "b.txt"
         os.link(str(path_a), str(path_b))
 
-        lines = (
-            make_json_line(secret, "Generic", str(path_a))
-            + "\n"
-            + make_json_line(secret, "Generic", str(path_b))
-            + "\n"
+        lines = ndjson(
+            make_json_line(secret, "Generic", str(path_a)),
+            make_json_line(secret, "Generic", str(path_b)),
         )
         result = run_redactor(lines, extra_args=["--placeholder", "XXX"])
 
         assert result.returncode == 0
-        assert path_a.read_text() == "val=XXX\n"
-        assert path_b.read_text() == "val=XXX\n"
+        assert fast_read(path_a) == "val=XXX\n"
+        assert fast_read(path_b) == "val=XXX\n"
 
 
 # ── Misc ─────────────────────────────────────────────────────────────
 
 
 class TestMisc:
-    def test_preserves_file_permissions(self, tmp_path):
+    def test_preserves_file_permissions(
+        self, tmp_path, fast_write, fast_read, make_json_line
+    ):
         """File with 0o755 keeps that mode after redaction."""
         secret = "PERM_SECRET"
         target = tmp_path / "script.sh"
-        target.write_text(f"#!/bin/sh\nTOKEN={secret}\n")
+        fast_write(target, f"#!/bin/sh\nTOKEN={secret}\n")
         target.chmod(0o755)
 
         line = make_json_line(secret, "Generic", str(target))
         run_redactor(line + "\n", extra_args=["--placeholder", "XXX"])
 
-        assert target.read_text() == "#!/bin/sh\nTOKEN=XXX\n"
+        assert fast_read(target) == "#!/bin/sh\nTOKEN=XXX\n"
         mode = stat.S_IMODE(target.stat().st_mode)
         assert mode == 0o755
 
-    def test_exit_code_zero_on_success(self, tmp_path):
-        """Return code is 0 on successful redaction."""
-        secret = "EXIT_CODE_SECRET"
-        target = tmp_path / "rc.txt"
-        target.write_text(f"x={secret}\n")
+
+# ── Packaging ────────────────────────────────────────────────────────
+
+
+class TestPackaging:
+    def test_module_entry_point(
+        self, tmp_path, cli_cmd, fast_write, fast_read, make_json_line
+    ):
+        """`python -m trufflehog_redactor` works as a real subprocess."""
+        secret = "SUBPROCESS_SECRET"
+        target = tmp_path / "sub.txt"
+        fast_write(target, f"key={secret}\n")
 
         line = make_json_line(secret, "Generic", str(target))
-        result = run_redactor(line + "\n")
+        result = subprocess.run(
+            cli_cmd + ["--no-confirm", "--placeholder", "XXX"],
+            input=(line + "\n").encode(),
+            capture_output=True,
+        )
 
         assert result.returncode == 0
+        assert b"Redacted secrets in 1 file(s)." in result.stdout
+        assert fast_read(target) == "key=XXX\n"
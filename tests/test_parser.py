@@ -41,6 +41,13 @@ def test_parse_findings_valid_lines(make_json_line):
     assert findings[0].detector_name == "Generic"
 
 
+def test_parse_findings_accepts_binary_stream(make_json_line):
+    stream = io.BytesIO(("\n" + make_json_line() + "\r\n").encode())
+    findings = parse_findings(stream)
+    assert len(findings) == 1
+    assert findings[0].secret == "SUPERSECRETKEY1234"
+
+
 def test_parse_findings_empty_input():
     findings = parse_findings(io.StringIO(""))
     assert findings == []
@@ -1,13 +1,21 @@
 """Tests for trufflehog_redactor.redactor."""
 
+import difflib
 import logging
 import os
 import stat
+from unittest.mock import patch
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
 
 from trufflehog_redactor.parser import Finding
 from trufflehog_redactor.redactor import (
+    _fast_unified_diff,
     _group_by_file,
-    _validate_file,
+    _stat_file,
+    _write_all,
     apply_redactions,
     generate_diffs,
     generate_replacements,
@@ -16,105 +24,207 @@ from trufflehog_redactor.redactor import (
 # -- _group_by_file -----------------------------------------------------------
 
 
-def test_group_by_file_single(make_finding):
-    f = make_finding()
-    result = _group_by_file([f])
-    assert list(result.keys()) == [f.file_path]
-    assert result[f.file_path] == [f]
-
-
-def test_group_by_file_multiple(make_finding):
-    f1 = make_finding(file_path="/a.txt", secret="s1")
-    f2 = make_finding(file_path="/b.txt", secret="s2")
-    f3 = make_finding(file_path="/a.txt", secret="s3")
-    result = _group_by_file([f1, f2, f3])
-    assert set(result.keys()) == {"/a.txt", "/b.txt"}
-    assert len(result["/a.txt"]) == 2
-    assert len(result["/b.txt"]) == 1
+_findings_st = st.lists(
+    st.builds(
+        Finding,
+        file_path=st.sampled_from(["/a", "/b", "/c"]),
+        secret=st.text(min_size=1),
+        detector_name=st.just("G"),
+    )
+)
 
 
-def test_group_by_file_empty():
-    assert _group_by_file([]) == {}
+@settings(max_examples=25)
+@given(findings=_findings_st)
+def test_group_by_file(findings):
+    result = _group_by_file(findings)
+    assert sum(len(v) for v in result.values()) == len(findings)
+    assert set(result) == {f.file_path for f in findings}
+    for file_path, group in result.items():
+        # Each group keeps the input order of its findings
+        assert group == [f for f in findings if f.file_path == file_path]
 
 
-# -- _validate_file -----------------------------------------------------------
+# -- _stat_file -----------------------------------------------------------
 
 
-def test_validate_file_regular(tmp_path):
+def test_stat_file_regular(tmp_path, fast_write):
     f = tmp_path / "regular.txt"
-    f.write_text("content")
-    assert _validate_file(str(f)) is True
+    fast_write(f, "content")
+    assert _stat_file(str(f)) is not None
 
 
-def test_validate_file_symlink(tmp_path):
+def test_stat_file_symlink(tmp_path, fast_write):
     target = tmp_path / "target.txt"
-    target.write_text("content")
+    fast_write(target, "content")
     link = tmp_path / "link.txt"
     link.symlink_to(target)
-    assert _validate_file(str(link)) is False
+    assert _stat_file(str(link)) is None
 
 
-def test_validate_file_missing(tmp_path):
-    assert _validate_file(str(tmp_path / "nonexistent.txt")) is False
+def test_stat_file_missing(tmp_path):
+    assert _stat_file(str(tmp_path / "nonexistent.txt")) is None
 
 
-def test_validate_file_hardlink_warns(tmp_path, caplog):
+def test_stat_file_hardlink_warns(tmp_path, log_records, fast_write):
     f = tmp_path / "original.txt"
-    f.write_text("content")
+    fast_write(f, "content")
     hardlink = tmp_path / "hardlink.txt"
     os.link(str(f), str(hardlink))
-    with caplog.at_level(logging.WARNING):
-        result = _validate_file(str(f))
-    assert result is True
-    assert "hard links" in caplog.text
+    result = _stat_file(str(f))
+    assert result is not None
+    assert result.st_nlink == 2
+    assert any(
+        r.levelno == logging.WARNING and "hard links" in r.getMessage()
+        for r in log_records
+    )
+
+
+@pytest.mark.parametrize("desc", ["regular", "symlink", "missing", "directory"])
+def test_stat_file_single_stat(desc, tmp_path, fast_write):
+    real = tmp_path / "real.txt"
+    fast_write(real, "content")
+    (tmp_path / "link.txt").symlink_to(real)
+    (tmp_path / "dir").mkdir()
+    paths = {
+        "regular": real,
+        "symlink": tmp_path / "link.txt",
+        "missing": tmp_path / "nonexistent.txt",
+        "directory": tmp_path / "dir",
+    }
+    with patch("os.lstat", wraps=os.lstat) as mock_lstat:
+        _stat_file(str(paths[desc]))
+    assert mock_lstat.call_count == 1
 
 
 # -- generate_replacements ----------------------------------------------------
 
 
-def test_generate_replacements_basic(tmp_path):
+def test_generate_replacements_basic(tmp_path, fast_write):
     f = tmp_path / "test.txt"
-    f.write_text("my secret is TOPSECRET123 here")
+    fast_write(f, "my secret is TOPSECRET123 here")
     finding = Finding(file_path=str(f), secret="TOPSECRET123", detector_name="Generic")
     result = generate_replacements([finding], "[REDACTED]")
     assert str(f) in result
-    original, redacted = result[str(f)]
+    original, redacted, _ = result[str(f)]
     assert "TOPSECRET123" in original
     assert "[REDACTED]" in redacted
     assert "TOPSECRET123" not in redacted
 
 
-def test_generate_replacements_asterisk_default(tmp_path):
+def test_generate_replacements_asterisk_default(tmp_path, fast_write):
     f = tmp_path / "test.txt"
-    f.write_text("secret=ABC123")
+    fast_write(f, "secret=ABC123")
     finding = Finding(file_path=str(f), secret="ABC123", detector_name="Generic")
     result = generate_replacements([finding], "")
-    _, redacted = result[str(f)]
+    _, redacted, _ = result[str(f)]
     assert "******" in redacted
 
 
-def test_generate_replacements_longest_first(tmp_path):
+def test_generate_replacements_longest_first(tmp_path, fast_write):
     f = tmp_path / "test.txt"
-    f.write_text("token=ABCDEF and also ABCDEFGHIJ")
+    fast_write(f, "token=ABCDEF and also ABCDEFGHIJ")
     short = Finding(file_path=str(f), secret="ABCDEF", detector_name="G")
     long = Finding(file_path=str(f), secret="ABCDEFGHIJ", detector_name="G")
     result = generate_replacements([short, long], "[R]")
-    _, redacted = result[str(f)]
+    _, redacted, _ = result[str(f)]
     # The long secret should have been replaced first
     assert redacted == "token=[R] and also [R]"
 
 
-def test_generate_replacements_no_change_skipped(tmp_path):
+def test_generate_replacements_placeholder_not_rescanned(tmp_path, fast_write):
+    f = tmp_path / "test.txt"
+    fast_write(f, "token=SECRETVALUE and RED")
+    long = Finding(file_path=str(f), secret="SECRETVALUE", detector_name="G")
+    short = Finding(file_path=str(f), secret="RED", detector_name="G")
+    result = generate_replacements([short, long], "[REDACTED]")
+    _, redacted, _ = result[str(f)]
+    assert redacted == "token=[REDACTED] and [REDACTED]"
+
+
+def test_generate_replacements_overlapping_secrets(tmp_path, fast_write):
+    f = tmp_path / "test.txt"
+    fast_write(f, "key=xABCDEFGHIJ")
+    # "xABC" starts first and overlaps the longer secret; both go as one span
+    short = Finding(file_path=str(f), secret="xABC", detector_name="G")
+    long = Finding(file_path=str(f), secret="ABCDEFGHIJ", detector_name="G")
+    result = generate_replacements([short, long], "[R]")
+    _, redacted, _ = result[str(f)]
+    assert redacted == "key=[R]"
+
+
+def test_generate_replacements_shared_edge_character(tmp_path, fast_write):
+    f = tmp_path / "test.txt"
+    fast_write(f, "token=SECRETVALUE and RED")
+    secrets = ["SECRETVALUE", "RED"]
+    # Unrelated secrets whose first/last characters match must not matter
+    for extra in ([], ["SECRETVALUEX", "XYZZ"]):
+        findings = [
+            Finding(file_path=str(f), secret=s, detector_name="G")
+            for s in secrets + extra
+        ]
+        _, redacted, _ = generate_replacements(findings, "[REDACTED]")[str(f)]
+        assert redacted == "token=[REDACTED] and [REDACTED]"
+
+
+def test_generate_replacements_overlapping_secrets_asterisks(tmp_path, fast_write):
+    f = tmp_path / "test.txt"
+    fast_write(f, "key=xABCDEFGHIJ")
+    short = Finding(file_path=str(f), secret="xABC", detector_name="G")
+    long = Finding(file_path=str(f), secret="ABCDEFGHIJ", detector_name="G")
+    _, redacted, _ = generate_replacements([short, long], "")[str(f)]
+    assert redacted == "key=" + "*" * 11
+
+
+def test_generate_replacements_self_overlapping_secret(tmp_path, fast_write):
+    f = tmp_path / "test.txt"
+    fast_write(f, "k=ABABA")
+    finding = Finding(file_path=str(f), secret="ABA", detector_name="G")
+    _, redacted, _ = generate_replacements([finding], "")[str(f)]
+    assert redacted == "k=*****"
+
+
+def test_generate_replacements_large_file(tmp_path, fast_write):
+    f = tmp_path / "big.txt"
+    secrets = [f"SECRET{i:03d}XYZ" for i in range(50)]
+    # ~2 MB with a secret on every tenth line
+    lines = [
+        f"line {i} {secrets[i % 50] if i % 10 == 0 else 'filler'}\n"
+        for i in range(100_000)
+    ]
+    fast_write(f, "".join(lines))
+    findings = [Finding(file_path=str(f), secret=s, detector_name="G") for s in secrets]
+    _, redacted, _ = generate_replacements(findings, "[R]")[str(f)]
+    assert not any(s in redacted for s in secrets)
+    assert redacted.count("[R]") == 10_000
+
+
+def test_generate_replacements_many_files(tmp_path, fast_write):
+    findings = []
+    for i in range(20):
+        f = tmp_path / f"f{i}.txt"
+        fast_write(f, f"key=SECRET{i:02d}\n")
+        findings.append(
+            Finding(file_path=str(f), secret=f"SECRET{i:02d}", detector_name="G")
+        )
+    # One file without its secret is skipped, the rest are all redacted
+    fast_write(tmp_path / "f0.txt", "nothing here\n")
+    result = generate_replacements(findings, "[R]")
+    assert set(result) == {f.file_path for f in findings[1:]}
+    assert all(redacted == "key=[R]\n" for _, redacted, _ in result.values())
+
+
+def test_generate_replacements_no_change_skipped(tmp_path, fast_write):
     f = tmp_path / "test.txt"
-    f.write_text("nothing here")
+    fast_write(f, "nothing here")
     finding = Finding(file_path=str(f), secret="notpresent", detector_name="G")
     result = generate_replacements([finding], "[R]")
     assert result == {}
 
 
-def test_generate_replacements_skips_symlink(tmp_path):
+def test_generate_replacements_skips_symlink(tmp_path, fast_write):
     target = tmp_path / "target.txt"
-    target.write_text("secret=ABC")
+    fast_write(target, "secret=ABC")
     link = tmp_path / "link.txt"
     link.symlink_to(target)
     finding = Finding(file_path=str(link), secret="ABC", detector_name="G")
@@ -130,9 +240,18 @@ def test_generate_replacements_skips_missing(tmp_path):
     assert result == {}
 
 
-def test_generate_replacements_unicode_error(tmp_path):
+def test_generate_replacements_preserves_crlf(tmp_path, fast_write, fast_read):
+    f = tmp_path / "test.txt"
+    fast_write(f, "a=1\r\nsecret=ABC123\r\n")
+    finding = Finding(file_path=str(f), secret="ABC123", detector_name="G")
+    replacements = generate_replacements([finding], "[R]")
+    apply_redactions(replacements)
+    assert fast_read(f) == "a=1\r\nsecret=[R]\r\n"
+
+
+def test_generate_replacements_unicode_error(tmp_path, fast_write):
     f = tmp_path / "binary.bin"
-    f.write_bytes(b"\x80\x81\x82\x83")
+    fast_write(f, b"\x80\x81\x82\x83")
     finding = Finding(file_path=str(f), secret="ABC", detector_name="G")
     result = generate_replacements([finding], "[R]")
     assert result == {}
@@ -140,16 +259,19 @@ def test_generate_replacements_unicode_error(tmp_path):
 
 # -- generate_diffs -----------------------------------------------------------
 
+# generate_diffs ignores the stat; any stat_result fills the tuple slot.
+_ST = os.stat(__file__)
+
 
 def test_generate_diffs_without_masking():
-    replacements = {"/tmp/a.txt": ("secret=ABC\n", "secret=[R]\n")}
+    replacements = {"/tmp/a.txt": ("secret=ABC\n", "secret=[R]\n", _ST)}
     diff = generate_diffs(replacements)
     assert "-secret=ABC" in diff
     assert "+secret=[R]" in diff
 
 
 def test_generate_diffs_with_masking():
-    replacements = {"/tmp/a.txt": ("secret=ABCDEFGHIJKL\n", "secret=[R]\n")}
+    replacements = {"/tmp/a.txt": ("secret=ABCDEFGHIJKL\n", "secret=[R]\n", _ST)}
     findings = [
         Finding(file_path="/tmp/a.txt", secret="ABCDEFGHIJKL", detector_name="G")
     ]
@@ -159,10 +281,56 @@ def test_generate_diffs_with_masking():
     assert "ABCD" in diff  # first 4 visible chars from mask_secret
 
 
+def test_generate_diffs_masks_multiple_secrets():
+    replacements = {
+        "/tmp/a.txt": ("a=ABCDEFGHIJKL\nb=MNOPQRSTUVWX\n", "a=[R]\nb=[R]\n", _ST)
+    }
+    findings = [
+        Finding(file_path="/tmp/a.txt", secret="ABCDEFGHIJKL", detector_name="G"),
+        Finding(file_path="/tmp/a.txt", secret="MNOPQRSTUVWX", detector_name="G"),
+    ]
+    diff = generate_diffs(replacements, findings=findings)
+    assert "-a=ABCD****IJKL" in diff
+    assert "-b=MNOP****UVWX" in diff
+
+
+@pytest.mark.parametrize("desc, extra", [("alone", []), ("shared-edge", ["LX"])])
+def test_generate_diffs_masked_text_not_rescanned(desc, extra):
+    replacements = {"/tmp/a.txt": ("k=ABCDEFGHIJKL\n", "k=[R]\n", _ST)}
+    findings = [
+        Finding(file_path="/tmp/a.txt", secret=s, detector_name="G")
+        for s in ["ABCD", "ABCDEFGHIJKL"] + extra
+    ]
+    diff = generate_diffs(replacements, findings=findings)
+    assert "-k=ABCD****IJKL" in diff
+
+
+def test_generate_diffs_masks_overlapping_secrets():
+    replacements = {"/tmp/a.txt": ("k=xyzABCDEFGHIJ\n", "k=[R]\n", _ST)}
+    findings = [
+        Finding(file_path="/tmp/a.txt", secret=s, detector_name="G")
+        for s in ["xyzABCD", "ABCDEFGHIJ"]
+    ]
+    diff = generate_diffs(replacements, findings=findings)
+    assert "-k=xyzA*****GHIJ" in diff
+
+
+def test_generate_diffs_masks_large_file():
+    secrets = [f"SECRET{i:03d}XYZ" for i in range(50)]
+    original = "".join(f"{i}={secrets[i % 50]}\n" for i in range(20_000))
+    redacted = "".join(f"{i}=[R]\n" for i in range(20_000))
+    findings = [
+        Finding(file_path="/tmp/a.txt", secret=s, detector_name="G") for s in secrets
+    ]
+    diff = generate_diffs({"/tmp/a.txt": (original, redacted, _ST)}, findings=findings)
+    assert not any(s in diff for s in secrets)
+    assert "-49=SECR****9XYZ" in diff
+
+
 def test_generate_diffs_sorted_by_path():
     replacements = {
-        "/tmp/z.txt": ("s=Z\n", "s=[R]\n"),
-        "/tmp/a.txt": ("s=A\n", "s=[R]\n"),
+        "/tmp/z.txt": ("s=Z\n", "s=[R]\n", _ST),
+        "/tmp/a.txt": ("s=A\n", "s=[R]\n", _ST),
     }
     diff = generate_diffs(replacements)
     pos_a = diff.index("/tmp/a.txt")
@@ -170,39 +338,90 @@ def test_generate_diffs_sorted_by_path():
     assert pos_a < pos_z
 
 
+def test_generate_diffs_multiline_secret():
+    replacements = {"/tmp/a.txt": ("a\nBEGIN\nKEY\nb\n", "a\n[R]\nb\n", _ST)}
+    diff = generate_diffs(replacements)
+    assert "-BEGIN\n-KEY\n+[R]\n" in diff
+
+
+# -- _fast_unified_diff -------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "desc, changed",
+    [
+        ("single-line", [10]),
+        ("first-and-last", [0, 29]),
+        ("merged-hunks", [5, 11]),
+        ("split-hunks", [5, 12]),
+        ("adjacent-run", [7, 8, 9]),
+    ],
+)
+def test_fast_unified_diff_matches_difflib(desc, changed):
+    before = [f"line {i}\n" for i in range(30)]
+    after = [f"[R] {i}\n" if i in changed else line for i, line in enumerate(before)]
+    expected = list(difflib.unified_diff(before, after, fromfile="f", tofile="f"))
+    assert _fast_unified_diff(before, after, "f", "f") == expected
+
+
+def test_fast_unified_diff_no_changes():
+    lines = ["a\n", "b\n"]
+    assert _fast_unified_diff(lines, lines, "f", "f") == []
+
+
 # -- apply_redactions ---------------------------------------------------------
 
 
-def test_apply_redactions_writes_file(tmp_path):
+def test_apply_redactions_writes_file(tmp_path, fast_write, fast_read):
     f = tmp_path / "test.txt"
-    f.write_text("original content with SECRET")
+    fast_write(f, "original content with SECRET")
     replacements = {
-        str(f): ("original content with SECRET", "original content with [R]")
+        str(f): (
+            "original content with SECRET",
+            "original content with [R]",
+            os.stat(str(f)),
+        )
     }
     count = apply_redactions(replacements)
     assert count == 1
-    assert f.read_text() == "original content with [R]"
+    assert fast_read(f) == "original content with [R]"
 
 
-def test_apply_redactions_preserves_permissions(tmp_path):
+def test_apply_redactions_preserves_permissions(tmp_path, fast_write):
     f = tmp_path / "test.txt"
-    f.write_text("SECRET")
+    fast_write(f, "SECRET")
     os.chmod(str(f), 0o755)
-    replacements = {str(f): ("SECRET", "[R]")}
+    replacements = {str(f): ("SECRET", "[R]", os.stat(str(f)))}
     apply_redactions(replacements)
     assert stat.S_IMODE(os.stat(str(f)).st_mode) == 0o755
 
 
-def test_apply_redactions_multiple_files(tmp_path):
+def test_apply_redactions_multiple_files(tmp_path, fast_write, fast_read):
     f1 = tmp_path / "a.txt"
     f2 = tmp_path / "b.txt"
-    f1.write_text("SECRET1")
-    f2.write_text("SECRET2")
+    fast_write(f1, "SECRET1")
+    fast_write(f2, "SECRET2")
     replacements = {
-        str(f1): ("SECRET1", "[R1]"),
-        str(f2): ("SECRET2", "[R2]"),
+        str(f1): ("SECRET1", "[R1]", os.stat(str(f1))),
+        str(f2): ("SECRET2", "[R2]", os.stat(str(f2))),
     }
     count = apply_redactions(replacements)
     assert count == 2
-    assert f1.read_text() == "[R1]"
-    assert f2.read_text() == "[R2]"
+    assert fast_read(f1) == "[R1]"
+    assert fast_read(f2) == "[R2]"
+
+
+def test_write_all_handles_partial_writes(tmp_path, fast_read):
+    path = tmp_path / "out.txt"
+    real_write = os.write
+
+    def short_write(fd, data):
+        return real_write(fd, data[:3])
+
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT)
+    try:
+        with patch("os.write", side_effect=short_write):
+            _write_all(fd, "héllo wörld".encode())
+    finally:
+        os.close(fd)
+    assert fast_read(path) == "héllo wörld"
@@ -1,9 +1,11 @@
 """CLI orchestration: parse args, read findings, launch TUI, apply redactions."""
 
 import argparse
-import io
+import contextlib
 import subprocess
 import sys
+import tempfile
+from typing import IO, Iterator, List, Optional
 
 from trufflehog_redactor.parser import parse_findings
 from trufflehog_redactor.redactor import (
@@ -14,7 +16,7 @@ from trufflehog_redactor.redactor import (
 from trufflehog_redactor.tui import run_tui
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     parser = argparse.ArgumentParser(
         prog="trufflehog-redactor",
         description="Interactively redact secrets found by TruffleHog.",
@@ -41,12 +43,13 @@ def main() -> None:
         action="store_true",
         help="Show what would be changed without modifying files",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if args.path:
-        stream = _run_trufflehog(args.path)
+        with _run_trufflehog(args.path) as output:
+            findings = parse_findings(output)
     elif not sys.stdin.isatty():
-        stream = sys.stdin
+        findings = parse_findings(sys.stdin)
     else:
         parser.error(
             "No piped input detected and no path provided.\n"
@@ -55,8 +58,6 @@ def main() -> None:
             " 2>/dev/null | trufflehog-redactor"
         )
 
-    findings = parse_findings(stream)
-
     if not findings:
         print("No secrets found in input.")
         return
@@ -91,14 +92,22 @@ def main() -> None:
     print(f"Redacted secrets in {count} file(s).")
 
 
-def _confirm_changes(num_files: int, diff_output: str) -> bool:
-    """Show diff preview, prompt via /dev/tty. Returns True if user confirms."""
+def _confirm_changes(
+    num_files: int, diff_output: str, tty: Optional[IO[str]] = None
+) -> bool:
+    """Show diff preview, prompt via /dev/tty. Returns True if user confirms.
+
+    *tty* overrides the stream the answer is read from; by default
+    ``/dev/tty`` is opened so the prompt works while stdin is a pipe.
+    """
     print("\n--- Diff preview ---\n")
     print(diff_output)
     print("--- End preview ---\n")
 
     try:
-        with open("/dev/tty") as tty:
+        with contextlib.ExitStack() as stack:
+            if tty is None:
+                tty = stack.enter_context(open("/dev/tty"))
             prompt = f"Apply changes to {num_files} file(s)? [y/N] "
             print(prompt, end="", flush=True)
             answer = tty.readline().strip().lower()
@@ -112,26 +121,36 @@ def _confirm_changes(num_files: int, diff_output: str) -> bool:
     return answer == "y"
 
 
-def _run_trufflehog(path: str) -> io.StringIO:
-    """Run trufflehog on *path* and return its JSON output as a stream."""
-    try:
-        result = subprocess.run(
-            ["trufflehog", "filesystem", path, "--json", "--no-update", "--no-fail"],
-            capture_output=True,
-            text=True,
-        )
-    except FileNotFoundError:
-        print(
-            "Error: 'trufflehog' is not installed or not on your PATH.\n"
-            "Install it from https://github.com/trufflesecurity/trufflehog",
-            file=sys.stderr,
-        )
-        sys.exit(1)
-
-    if result.returncode not in (0, 1):
-        # trufflehog exits 1 when it finds secrets; other codes are errors
-        print("trufflehog exited with an error:", file=sys.stderr)
-        sys.stderr.write(result.stderr)
-        sys.exit(result.returncode)
-
-    return io.StringIO(result.stdout)
+@contextlib.contextmanager
+def _run_trufflehog(path: str) -> Iterator[IO[bytes]]:
+    """Run trufflehog on *path* and yield its JSON output as a binary stream.
+
+    The output is parsed as it arrives rather than captured whole. stderr
+    goes to a temporary file so a chatty scan cannot fill a pipe and stall;
+    it is only shown if trufflehog fails.
+    """
+    cmd = ["trufflehog", "filesystem", path, "--json", "--no-update", "--no-fail"]
+    with tempfile.TemporaryFile() as errors:
+        try:
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=errors,
+            )
+        except FileNotFoundError:
+            print(
+                "Error: 'trufflehog' is not installed or not on your PATH.\n"
+                "Install it from https://github.com/trufflesecurity/trufflehog",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+
+        with proc:
+            yield proc.stdout
+
+        if proc.returncode not in (0, 1):
+            # trufflehog exits 1 when it finds secrets; other codes are errors
+            print("trufflehog exited with an error:", file=sys.stderr)
+            errors.seek(0)
+            sys.stderr.write(errors.read().decode("utf-8", errors="replace"))
+            sys.exit(proc.returncode)
@@ -1,9 +1,14 @@
 """Parse TruffleHog JSON output from stdin."""
 
-import json
 import sys
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import IO, List, Optional, Set, Tuple
+from typing import IO, Dict, List, Set, Union
+
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
 
 
 @dataclass
@@ -13,39 +18,42 @@ class Finding:
     detector_name: str
 
 
-def parse_findings(stream: Optional[IO[str]] = None) -> List[Finding]:
-    """Read TruffleHog JSON lines from a stream and return deduplicated findings."""
+def parse_findings(stream: Union[IO[str], IO[bytes], None] = None) -> List[Finding]:
+    """Read TruffleHog JSON lines and return deduplicated findings.
+
+    *stream* is a text or binary stream (stdin by default), consumed line by
+    line so memory stays bounded by the findings.
+    """
     if stream is None:
         stream = sys.stdin
 
-    seen: Set[Tuple[str, str]] = set()
+    # Raw secrets already seen, per file path
+    seen: Dict[str, Set[str]] = defaultdict(set)
     findings: List[Finding] = []
 
     for line in stream:
-        line = line.strip()
-        if not line:
-            continue
+        # Line endings and blank lines are handled by the parser, which
+        # accepts surrounding whitespace and rejects an empty document.
         try:
-            obj = json.loads(line)
-        except json.JSONDecodeError:
+            obj = _loads(line)
+        except ValueError:
             continue
 
         raw = obj.get("Raw", "")
         detector = obj.get("DetectorName", "Unknown")
-        file_path = ""
-
-        source_meta = obj.get("SourceMetadata", {})
-        data = source_meta.get("Data", {}) if isinstance(source_meta, dict) else {}
-        filesystem = data.get("Filesystem", {}) if isinstance(data, dict) else {}
-        file_path = filesystem.get("file", "") if isinstance(filesystem, dict) else ""
+        try:
+            file_path = obj["SourceMetadata"]["Data"]["Filesystem"]["file"]
+        except (KeyError, TypeError):
+            # Missing key, or an intermediate value that is not a dict
+            file_path = ""
 
         if not _valid_finding(raw, file_path):
             continue
 
-        key = (file_path, raw)
-        if key in seen:
+        seen_raws = seen[file_path]
+        if raw in seen_raws:
             continue
-        seen.add(key)
+        seen_raws.add(raw)
 
         findings.append(
             Finding(file_path=file_path, secret=raw, detector_name=detector)
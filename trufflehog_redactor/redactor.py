@@ -4,49 +4,137 @@ import contextlib
 import difflib
 import logging
 import os
+import stat
 import tempfile
 from collections import defaultdict
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
 
 from trufflehog_redactor.parser import Finding
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on threads used to read/write files concurrently
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
 
 def generate_replacements(
     findings: List[Finding], placeholder: str
-) -> Dict[str, Tuple[str, str]]:
-    """For each file, produce (original_content, redacted_content).
+) -> Dict[str, Tuple[str, str, os.stat_result]]:
+    """For each file, produce (original_content, redacted_content, stat).
+
+    *stat* is the file's ``lstat`` taken during validation; it is reused to
+    preserve permissions and ownership when the file is rewritten.
 
-    Secrets are replaced longest-first to avoid partial-match issues.
+    Overlapping secrets are redacted as one span so none is partly exposed.
+    Files are processed concurrently.
     """
     grouped = _group_by_file(findings)
-    results: Dict[str, Tuple[str, str]] = {}
+    outcomes = _map_files(
+        lambda item: _process_file(item[0], item[1], placeholder),
+        list(grouped.items()),
+    )
+    return {
+        file_path: outcome
+        for file_path, outcome in zip(grouped, outcomes)
+        if outcome is not None
+    }
 
-    for file_path, file_findings in grouped.items():
-        if not _validate_file(file_path):
-            continue
 
-        try:
-            with open(file_path, encoding="utf-8") as fh:
-                original = fh.read()
-        except (PermissionError, OSError) as exc:
-            logger.warning(f"Cannot read {file_path}: {exc}")
-            continue
-        except UnicodeDecodeError as exc:
-            logger.warning(f"Cannot decode {file_path} as UTF-8: {exc}")
-            continue
+def _process_file(
+    file_path: str, file_findings: List[Finding], placeholder: str
+) -> Optional[Tuple[str, str, os.stat_result]]:
+    """Return (original, redacted, stat) for one file, or None to skip it."""
+    st = _stat_file(file_path)
+    if st is None:
+        return None
+
+    try:
+        with open(file_path, "rb") as fh:
+            # Decode in one go; binary mode also keeps CRLF line endings
+            original = fh.read().decode("utf-8")
+    except (PermissionError, OSError) as exc:
+        logger.warning(f"Cannot read {file_path}: {exc}")
+        return None
+    except UnicodeDecodeError as exc:
+        logger.warning(f"Cannot decode {file_path} as UTF-8: {exc}")
+        return None
+
+    replace = _secret_replacer(
+        (f.secret for f in file_findings),
+        lambda span: placeholder or "*" * len(span),
+    )
+    redacted = replace(original)
 
-        redacted = original
-        # Sort by length descending so longer secrets are replaced first
-        for f in sorted(file_findings, key=lambda x: len(x.secret), reverse=True):
-            replacement = placeholder if placeholder else "*" * len(f.secret)
-            redacted = redacted.replace(f.secret, replacement)
+    if redacted == original:
+        return None
+    return original, redacted, st
 
-        if redacted != original:
-            results[file_path] = (original, redacted)
 
-    return results
+def _map_files(func: Callable[[_T], _R], items: List[_T]) -> List[_R]:
+    """Apply *func* to each item, using a thread pool when there are several.
+
+    Only the file reads and writes release the GIL and overlap across
+    threads; secret matching and string building still run one at a time.
+    Results keep the input order.
+    """
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(items))) as pool:
+        return list(pool.map(func, items))
+
+
+def _secret_replacer(
+    secrets: Iterable[str], replacement: Callable[[str], str]
+) -> Callable[[str], str]:
+    """Return a function that replaces every occurrence of *secrets* in a text.
+
+    Occurrences are located with ``str.find``, including ones that overlap
+    each other. Overlapping occurrences are merged into a single span, and
+    each span is replaced by ``replacement(span_text)``, so no part of a
+    secret is left exposed and replacement text is never scanned again.
+    """
+    unique = {s for s in secrets if s}
+    if len(unique) == 1:
+        (secret,) = unique
+        # Without a border (a proper suffix that is also a prefix) occurrences
+        # of a lone secret cannot overlap, so one str.replace gives the same
+        # result without building spans
+        if not any(secret.startswith(secret[-k:]) for k in range(1, len(secret))):
+            redacted = replacement(secret)
+            return lambda text: text.replace(secret, redacted)
+
+    def replace(text: str) -> str:
+        find = text.find
+        found: List[Tuple[int, int]] = []
+        for secret in unique:
+            start = find(secret)
+            while start != -1:
+                found.append((start, start + len(secret)))
+                start = find(secret, start + 1)
+        if not found:
+            return text
+
+        spans: List[List[int]] = []
+        for start, end in sorted(found):
+            if spans and start < spans[-1][1]:
+                spans[-1][1] = max(spans[-1][1], end)
+            else:
+                spans.append([start, end])
+
+        parts: List[str] = []
+        pos = 0
+        for start, end in spans:
+            parts.append(text[pos:start])
+            parts.append(replacement(text[start:end]))
+            pos = end
+        parts.append(text[pos:])
+        return "".join(parts)
+
+    return replace
 
 
 def _group_by_file(findings: List[Finding]) -> Dict[str, List[Finding]]:
@@ -57,25 +145,32 @@ def _group_by_file(findings: List[Finding]) -> Dict[str, List[Finding]]:
     return dict(grouped)
 
 
-def _validate_file(file_path: str) -> bool:
-    """Check that a file path is safe to read/write."""
-    if os.path.islink(file_path):
+def _stat_file(file_path: str) -> Optional[os.stat_result]:
+    """Return the file's stat if the path is safe to read/write, else None.
+
+    A single ``lstat`` provides the symlink, regular-file and link-count checks.
+    """
+    try:
+        st = os.lstat(file_path)
+    except OSError:
+        logger.warning(f"Skipping missing file: {file_path}")
+        return None
+    if stat.S_ISLNK(st.st_mode):
         logger.warning(f"Skipping symlink: {file_path}")
-        return False
-    if not os.path.isfile(file_path):
+        return None
+    if not stat.S_ISREG(st.st_mode):
         logger.warning(f"Skipping missing file: {file_path}")
-        return False
-    st = os.stat(file_path)
+        return None
     if st.st_nlink > 1:
         logger.warning(
             f"{file_path} has {st.st_nlink} hard links — other links will "
             "retain the unredacted secret after redaction"
         )
-    return True
+    return st
 
 
 def generate_diffs(
-    replacements: Dict[str, Tuple[str, str]],
+    replacements: Dict[str, Tuple[str, str, os.stat_result]],
     findings: Optional[List[Finding]] = None,
 ) -> str:
     """Generate a unified diff string for all files.
@@ -85,59 +180,133 @@ def generate_diffs(
     """
     diff_parts: List[str] = []
 
+    grouped = _group_by_file(findings) if findings else {}
     if findings:
         from trufflehog_redactor.tui import mask_secret
 
-    for file_path, (original, redacted) in sorted(replacements.items()):
+    for file_path, (original, redacted, _st) in sorted(replacements.items()):
         display_original = original
         display_redacted = redacted
 
         if findings:
             # Mask raw secrets in both sides so the diff doesn't leak them
-            file_findings = sorted(
-                [f for f in findings if f.file_path == file_path],
-                key=lambda x: len(x.secret),
-                reverse=True,
+            mask = _secret_replacer(
+                (f.secret for f in grouped.get(file_path, [])), mask_secret
+            )
+            display_original = mask(original)
+            display_redacted = mask(redacted)
+
+        before = display_original.splitlines(keepends=True)
+        after = display_redacted.splitlines(keepends=True)
+        if len(before) == len(after):
+            diff = _fast_unified_diff(before, after, file_path, file_path)
+        else:
+            # A secret or placeholder spanning lines shifts the alignment
+            diff = difflib.unified_diff(
+                before, after, fromfile=file_path, tofile=file_path
             )
-            for f in file_findings:
-                masked = mask_secret(f.secret)
-                display_original = display_original.replace(f.secret, masked)
-                display_redacted = display_redacted.replace(f.secret, masked)
-
-        diff = difflib.unified_diff(
-            display_original.splitlines(keepends=True),
-            display_redacted.splitlines(keepends=True),
-            fromfile=file_path,
-            tofile=file_path,
-        )
         diff_parts.append("".join(diff))
 
     return "\n".join(diff_parts)
 
 
-def apply_redactions(replacements: Dict[str, Tuple[str, str]]) -> int:
+def _fast_unified_diff(
+    before: List[str], after: List[str], fromfile: str, tofile: str, n: int = 3
+) -> List[str]:
+    """Unified diff of two equal-length line lists, in difflib's format.
+
+    Replacements edit lines in place, so line i of *before* pairs with line
+    i of *after*. This compares the pairs directly and skips difflib's
+    sequence matching. Hunks get *n* lines of context and are merged when
+    at most 2*n unchanged lines separate them, as difflib does.
+    """
+    changed = [i for i, (a, b) in enumerate(zip(before, after)) if a != b]
+    if not changed:
+        return []
+
+    # Group changed line indices into hunks of (first, last) changed lines
+    hunks: List[Tuple[int, int]] = []
+    first = last = changed[0]
+    for i in changed[1:]:
+        if i - last - 1 > 2 * n:
+            hunks.append((first, last))
+            first = i
+        last = i
+    hunks.append((first, last))
+
+    lines = [f"--- {fromfile}\n", f"+++ {tofile}\n"]
+    for first, last in hunks:
+        lo = max(0, first - n)
+        hi = min(len(before), last + n + 1)
+        span = _format_range(lo, hi)
+        lines.append(f"@@ -{span} +{span} @@\n")
+        i = lo
+        while i < hi:
+            if before[i] == after[i]:
+                lines.append(" " + before[i])
+                i += 1
+                continue
+            # A run of changed lines: all removals, then all additions
+            j = i
+            while j < hi and before[j] != after[j]:
+                j += 1
+            lines.extend("-" + line for line in before[i:j])
+            lines.extend("+" + line for line in after[i:j])
+            i = j
+    return lines
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Format a hunk range the way difflib's unified_diff does."""
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    return f"{start + 1},{length}"
+
+
+def apply_redactions(
+    replacements: Dict[str, Tuple[str, str, os.stat_result]],
+) -> int:
     """Write redacted content to files atomically. Returns number of files modified."""
-    count = 0
-    for file_path, (_original, redacted) in replacements.items():
-        dir_name = os.path.dirname(file_path) or "."
+    written = _map_files(
+        lambda item: _write_redacted(item[0], item[1][1], item[1][2]),
+        list(replacements.items()),
+    )
+    return sum(written)
+
+
+def _write_redacted(file_path: str, redacted: str, st: os.stat_result) -> bool:
+    """Atomically replace *file_path* with *redacted*. Returns True on success.
+
+    *st* is the original file's stat, whose mode and ownership are kept.
+    """
+    dir_name = os.path.dirname(file_path) or "."
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=dir_name, suffix=".tmp")
         try:
-            fd, tmp_path = tempfile.mkstemp(dir=dir_name, suffix=".tmp")
             try:
-                with os.fdopen(fd, "w", encoding="utf-8") as fh:
-                    fh.write(redacted)
-                # Preserve original file permissions and ownership
-                st = os.stat(file_path)
-                os.chmod(tmp_path, st.st_mode)
-                with contextlib.suppress(PermissionError):
-                    os.chown(tmp_path, st.st_uid, st.st_gid)
-                os.replace(tmp_path, file_path)
-            except BaseException:
-                # Clean up temp file on any failure
-                with contextlib.suppress(OSError):
-                    os.unlink(tmp_path)
-                raise
-        except (PermissionError, OSError) as exc:
-            logger.warning(f"Cannot write {file_path}: {exc}")
-            continue
-        count += 1
-    return count
+                _write_all(fd, redacted.encode("utf-8"))
+            finally:
+                os.close(fd)
+            # Preserve original file permissions and ownership
+            os.chmod(tmp_path, st.st_mode)
+            with contextlib.suppress(PermissionError):
+                os.chown(tmp_path, st.st_uid, st.st_gid)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            # Clean up temp file on any failure
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+    except (PermissionError, OSError) as exc:
+        logger.warning(f"Cannot write {file_path}: {exc}")
+        return False
+    return True
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write all of *data* to *fd*, retrying on partial writes."""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
@@ -3,7 +3,10 @@
 import curses
 import os
 import sys
-from typing import List
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple
 
 from trufflehog_redactor.parser import Finding
 
@@ -15,6 +18,36 @@ _MIN_SECRET_WIDTH = 10  # Minimum display width for the masked secret
 _MIN_PATH_WIDTH = 5  # Minimum display width for the file path
 _PATH_BUDGET = 20  # Space reserved for path when computing secret width
 _ELLIPSIS = "..."  # Truncation indicator
+# Keys that only move the cursor, so only two rows need repainting
+_CURSOR_KEYS = (curses.KEY_UP, curses.KEY_DOWN, ord("k"), ord("j"))
+
+
+@dataclass
+class TuiState:
+    """Per-finding selection flags plus a running count of selected ones."""
+
+    selected: List[bool]
+    selected_count: int
+
+    @classmethod
+    def all_selected(cls, n: int) -> "TuiState":
+        return cls(selected=[True] * n, selected_count=n)
+
+
+class FindingColumns(NamedTuple):
+    """Findings split into parallel per-field lists for the TUI hot paths."""
+
+    file_paths: List[str]
+    secrets: List[str]
+    detector_names: List[str]
+
+    @classmethod
+    def from_findings(cls, findings: List[Finding]) -> "FindingColumns":
+        return cls(
+            file_paths=[f.file_path for f in findings],
+            secrets=[f.secret for f in findings],
+            detector_names=[f.detector_name for f in findings],
+        )
 
 
 def mask_secret(secret: str, visible: int = 4) -> str:
@@ -33,7 +66,9 @@ def run_tui(findings: List[Finding]) -> List[Finding]:
     if tty_file is None:
         return []
 
-    selected = [True] * len(findings)
+    columns = FindingColumns.from_findings(findings)
+    state = TuiState.all_selected(len(findings))
+    by_detector = _index_by_detector(columns.detector_names)
     cursor = 0
     top = 0
     reveal = False
@@ -43,30 +78,54 @@ def run_tui(findings: List[Finding]) -> List[Finding]:
         curses.curs_set(0)
         curses.use_default_colors()
 
+        full_redraw = True
+        old_cursor = cursor
         while True:
-            stdscr.clear()
             max_y, max_x = stdscr.getmaxyx()
             list_start = _HEADER_ROWS
             visible = max_y - list_start - _BOTTOM_RESERVE
 
             top_val = _adjust_scroll(cursor, top, visible)
-            # Update the outer `top` so it persists across iterations
-            top = top_val
-
-            _draw_header(stdscr, max_x)
-            _draw_list(stdscr, findings, selected, cursor, top, reveal, max_y, max_x)
+            if full_redraw or top_val != top:
+                # Update the outer `top` so it persists across iterations
+                top = top_val
+                stdscr.erase()
+                _draw_header(stdscr, max_x)
+                _draw_list(stdscr, columns, state, cursor, top, reveal, max_y, max_x)
+            else:
+                # Only the cursor moved within the visible window
+                for idx in (old_cursor, cursor):
+                    _draw_finding_row(
+                        stdscr.addnstr,
+                        list_start + idx - top,
+                        max_x,
+                        columns.detector_names[idx],
+                        columns.secrets[idx],
+                        columns.file_paths[idx],
+                        state.selected[idx],
+                        curses.A_REVERSE if idx == cursor else 0,
+                        reveal,
+                    )
             stdscr.refresh()
 
-            key = stdscr.getch()
-            cursor, reveal, result = _handle_key(
-                key,
-                findings,
-                selected,
-                cursor,
-                reveal,
-            )
-            if result is not None:
-                return result
+            old_cursor = cursor
+            full_redraw = False
+            for key in _read_keys(stdscr):
+                if key == curses.KEY_RESIZE:
+                    # Cached rows for the old width won't be reused
+                    _format_row.cache_clear()
+                    stdscr.clear()
+                cursor, reveal, result = _handle_key(
+                    key,
+                    columns,
+                    state,
+                    by_detector,
+                    cursor,
+                    reveal,
+                )
+                if result is not None:
+                    return result
+                full_redraw = full_redraw or key not in _CURSOR_KEYS
 
     old_stdin_fd = os.dup(0)
     os.dup2(tty_file.fileno(), 0)
@@ -77,6 +136,8 @@ def run_tui(findings: List[Finding]) -> List[Finding]:
         os.dup2(old_stdin_fd, 0)
         os.close(old_stdin_fd)
         tty_file.close()
+        # Cached rows hold raw secrets; don't keep them once the TUI is gone
+        _format_row.cache_clear()
 
     return result
 
@@ -101,6 +162,32 @@ def _open_tty():
         return None
 
 
+def _read_keys(stdscr: "curses.window") -> List[int]:
+    """Block for one key, then drain any already queued behind it.
+
+    Handling a burst (e.g. a held-down arrow) as one batch lets the caller
+    redraw once instead of once per key.
+    """
+    keys = [stdscr.getch()]
+    stdscr.nodelay(True)
+    try:
+        key = stdscr.getch()
+        while key != -1:
+            keys.append(key)
+            key = stdscr.getch()
+    finally:
+        stdscr.nodelay(False)
+    return keys
+
+
+def _index_by_detector(detector_names: List[str]) -> Dict[str, List[int]]:
+    """Map each detector name to the indices of its findings."""
+    by_detector: Dict[str, List[int]] = defaultdict(list)
+    for i, name in enumerate(detector_names):
+        by_detector[name].append(i)
+    return dict(by_detector)
+
+
 def _adjust_scroll(cursor: int, top: int, visible: int) -> int:
     """Return an updated scroll offset so the cursor stays visible."""
     if cursor < top:
@@ -123,8 +210,8 @@ def _draw_header(stdscr: "curses.window", max_x: int) -> None:
 
 def _draw_list(
     stdscr: "curses.window",
-    findings: List[Finding],
-    selected: List[bool],
+    columns: FindingColumns,
+    state: TuiState,
     cursor: int,
     top: int,
     reveal: bool,
@@ -135,43 +222,70 @@ def _draw_list(
     list_start = _HEADER_ROWS
     visible = max_y - list_start - _BOTTOM_RESERVE
 
-    for idx in range(top, min(top + visible, len(findings))):
+    file_paths, secrets, detector_names = columns
+    selected = state.selected
+    total = len(secrets)
+    # Bound once here rather than looked up again for every row
+    addnstr = stdscr.addnstr
+    reverse = curses.A_REVERSE
+
+    for idx in range(top, min(top + visible, total)):
         row = list_start + idx - top
         _draw_finding_row(
-            stdscr,
+            addnstr,
             row,
             max_x,
-            findings[idx],
+            detector_names[idx],
+            secrets[idx],
+            file_paths[idx],
             selected[idx],
-            idx == cursor,
+            reverse if idx == cursor else 0,
             reveal,
         )
 
-    count = sum(selected)
-    status = f"{count}/{len(findings)} selected"
-    stdscr.addnstr(max_y - 1, 0, status, max_x - 1, curses.A_DIM)
+    status = f"{state.selected_count}/{total} selected"
+    addnstr(max_y - 1, 0, status, max_x - 1, curses.A_DIM)
 
 
 def _draw_finding_row(
-    stdscr: "curses.window",
+    addnstr: Callable[..., None],
     row: int,
     max_x: int,
-    finding: Finding,
+    detector_name: str,
+    secret: str,
+    file_path: str,
     is_selected: bool,
-    is_cursor: bool,
+    attr: int,
     reveal: bool,
 ) -> None:
-    """Render a single finding row at the given screen position."""
-    mark = "x" if is_selected else " "
-    masked = finding.secret if reveal else mask_secret(finding.secret)
-    prefix = f"[{mark}] {finding.detector_name:<{_DETECTOR_COL_WIDTH}s} "
-    secret_max = max(_MIN_SECRET_WIDTH, max_x - 1 - len(prefix) - 1 - _PATH_BUDGET)
+    """Render a single finding row at the given screen position.
+
+    *addnstr* is the window's bound ``addnstr`` and *attr* the row's
+    attributes (``curses.A_REVERSE`` for the cursor row).
+    """
+    mark = "[x] " if is_selected else "[ ] "
+    line = mark + _format_row(detector_name, secret, file_path, max_x, reveal)
+    addnstr(row, 0, line, max_x - 1, attr)
+
+
+@lru_cache(maxsize=8192)
+def _format_row(
+    detector_name: str, secret: str, file_path: str, max_x: int, reveal: bool
+) -> str:
+    """Format a row after its selection mark, sized for a max_x-wide screen.
+
+    The text does not depend on the mark or cursor, so a redraw costs one
+    cache lookup per row.
+    """
+    masked = secret if reveal else mask_secret(secret)
+    prefix = f"{detector_name:<{_DETECTOR_COL_WIDTH}s} "
+    # Width already used by the selection mark in front of the prefix
+    used = len("[x] ") + len(prefix)
+    secret_max = max(_MIN_SECRET_WIDTH, max_x - 1 - used - 1 - _PATH_BUDGET)
     masked = _truncate_secret(masked, secret_max)
-    path_max = max(_MIN_PATH_WIDTH, max_x - 1 - len(prefix) - len(masked) - 1)
-    path_display = _truncate_path(finding.file_path, path_max)
-    line = f"{prefix}{masked} {path_display}"
-    attr = curses.A_REVERSE if is_cursor else 0
-    stdscr.addnstr(row, 0, line, max_x - 1, attr)
+    path_max = max(_MIN_PATH_WIDTH, max_x - 1 - used - len(masked) - 1)
+    path_display = _truncate_path(file_path, path_max)
+    return f"{prefix}{masked} {path_display}"
 
 
 def _truncate_secret(text: str, max_width: int) -> str:
@@ -195,40 +309,50 @@ def _truncate_path(path: str, max_width: int) -> str:
 
 def _handle_key(
     key: int,
-    findings: List[Finding],
-    selected: List[bool],
+    columns: FindingColumns,
+    state: TuiState,
+    by_detector: Dict[str, List[int]],
     cursor: int,
     reveal: bool,
 ) -> tuple:
     """Process a keypress and return (cursor, reveal, result).
 
     *result* is None while the loop should continue, a list of Finding
-    when the user confirms, or an empty list when they quit.
+    when the user confirms, or an empty list when they quit. *by_detector*
+    is the precomputed index from ``_index_by_detector``.
     """
+    total = len(columns.secrets)
     if key == curses.KEY_UP or key == ord("k"):
         cursor = max(0, cursor - 1)
     elif key == curses.KEY_DOWN or key == ord("j"):
-        cursor = min(len(findings) - 1, cursor + 1)
+        cursor = min(total - 1, cursor + 1)
     elif key == ord(" "):
-        selected[cursor] = not selected[cursor]
+        state.selected[cursor] = not state.selected[cursor]
+        state.selected_count += 1 if state.selected[cursor] else -1
     elif key == ord("a"):
-        if all(selected):
-            selected[:] = [False] * len(findings)
+        if state.selected_count == total:
+            state.selected[:] = [False] * total
+            state.selected_count = 0
         else:
-            selected[:] = [True] * len(findings)
+            state.selected[:] = [True] * total
+            state.selected_count = total
     elif key == ord("t"):
-        cat = findings[cursor].detector_name
-        indices = [i for i, f in enumerate(findings) if f.detector_name == cat]
-        if all(selected[i] for i in indices):
-            for i in indices:
-                selected[i] = False
-        else:
-            for i in indices:
-                selected[i] = True
+        indices = by_detector[columns.detector_names[cursor]]
+        value = not all(state.selected[i] for i in indices)
+        for i in indices:
+            if state.selected[i] != value:
+                state.selected[i] = value
+                state.selected_count += 1 if value else -1
     elif key == ord("r"):
         reveal = not reveal
     elif key == ord("\n"):
-        return cursor, reveal, [f for f, s in zip(findings, selected) if s]
+        file_paths, secrets, detector_names = columns
+        chosen = [
+            Finding(file_paths[i], secrets[i], detector_names[i])
+            for i, s in enumerate(state.selected)
+            if s
+        ]
+        return cursor, reveal, chosen
     elif key == ord("q"):
         return cursor, reveal, []
 